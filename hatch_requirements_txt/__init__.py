@@ -27,18 +27,60 @@ Hatchling plugin to read project dependencies from ``requirements.txt``.
 #
 
 # stdlib
+import codecs
+import collections
+import contextlib
+import hashlib
+import importlib
+import itertools
+import json
 import os
 import re
+import sys
 import warnings
-from typing import Dict, Iterable, List, Optional, Tuple, Type
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+		IO,
+		Any,
+		AnyStr,
+		Deque,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		NamedTuple,
+		Optional,
+		Set,
+		Tuple,
+		Type,
+		cast
+		)
 
 # 3rd party
 from hatchling.metadata.plugin.interface import MetadataHookInterface
 from hatchling.plugin import hookimpl
-from packaging.requirements import Requirement
+from packaging.markers import Marker, default_environment
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
 from packaging.utils import canonicalize_name
 
-__all__ = ("RequirementsMetadataHook", "parse_requirements")
+__all__ = (
+		"IndexEntry",
+		"PARALLEL_THRESHOLD",
+		"ParsedRequirement",
+		"PipOption",
+		"RequirementIndex",
+		"RequirementsFileError",
+		"RequirementsMetadataHook",
+		"RequirementsValidationError",
+		"load_parsed_requirements",
+		"load_requirements_files",
+		"load_requirements_with_options",
+		"parse_requirements",
+		"python_version_tables",
+		"requirements_fingerprint",
+		"validate_requirements",
+		)
 
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2022 Dominic Davis-Foster"
@@ -46,12 +88,6 @@ __license__: str = "MIT License"
 __version__: str = "0.4.1"
 __email__: str = "dominic@davis-foster.co.uk"
 
-# Regular expression for matching comments at the end of requirements
-# From pip (pip/_internal/req/req_file.py#L45)
-COMMENT_RE = re.compile(r"(^|\s+)#.*$")
-
-PIP_COMMAND_RE = re.compile(r"\s+(-[A-Za-z]|--[A-Za-z]+)")
-
 
 def parse_requirements(requirements: Iterable[str]) -> Tuple[List[Requirement], List[str]]:
 	"""
@@ -66,35 +102,59 @@ def parse_requirements(requirements: Iterable[str]) -> Tuple[List[Requirement],
 	parsed_requirements: List[Requirement] = []
 
 	for line in requirements:
-		if line.lstrip().startswith('#'):
+		stripped_line = line.lstrip()
+		if stripped_line.startswith('#'):
 			comments.append(line)
-		elif line.lstrip().startswith('-'):
+		elif stripped_line.startswith('-'):
 			# Likely an argument to pip from a requirements.txt file intended for pip
 			# (e.g. from pip-compile)
 			pass
-		elif line:
-			# Strip comments from end of line
-			line = COMMENT_RE.sub('', line)
-			if '-' in line:
-				line = PIP_COMMAND_RE.split(line)[0]
-			req = Requirement(line)
+		elif stripped_line:
+			req = Requirement(_requirement_slice(stripped_line))
 			req.name = canonicalize_name(req.name)
 			parsed_requirements.append(req)
 
 	return parsed_requirements, comments
 
 
-def load_requirements_files(files: List[str]) -> Tuple[List[Requirement], List[str]]:
+class RequirementsFileError(NamedTuple):
+	"""
+	A problem found in a requirements file when validating it.
 	"""
-	Load the given requirements files.
 
-	:param files:
+	#: The requirements file.
+	filename: str
 
-	:return: The requirements, and a list of commented lines.
+	#: The (1-based) line number of the problem, or :py:obj:`None` if it concerns the whole file.
+	lineno: Optional[int]
+
+	#: Description of the problem.
+	message: str
+
+	def __str__(self) -> str:
+		if self.lineno is None:
+			return f"{self.filename}: {self.message}"
+		return f"{self.filename}:{self.lineno}: {self.message}"
+
+
+class RequirementsValidationError(ValueError):
 	"""
+	Raised when validation finds one or more problems in the requirements files.
 
-	all_parsed_requirements: List[Requirement] = []
-	all_comments = []
+	:param errors:
+	"""
+
+	#: The problems found, in the order they were encountered.
+	errors: List[RequirementsFileError]
+
+	def __init__(self, errors: List[RequirementsFileError]) -> None:
+		self.errors = errors
+		count = f"{len(errors)} error" if len(errors) == 1 else f"{len(errors)} errors"
+		super().__init__('\n'.join([f"Found {count} in requirements files:", *map(str, errors)]))
+
+
+def _check_file_types(files: List[str]) -> None:
+	# Check the list of requirements files given in the configuration is a list of strings.
 
 	if not isinstance(files, List):
 		raise TypeError(f"Requirements files must be a list, but got {type(files)}: {files}.")
@@ -102,18 +162,1113 @@ def load_requirements_files(files: List[str]) -> Tuple[List[Requirement], List[s
 	for filename in files:
 		if not isinstance(filename, str):
 			raise TypeError(f"Requirements file {filename} must be a string, but got {type(filename)}.")
-		if not os.path.isfile(filename):
+
+
+def _check_files(files: List[str], errors: Optional[List[RequirementsFileError]] = None) -> List[str]:
+	# Validate the list of requirements files given in the configuration, and return the files which exist.
+	# Missing files are recorded in 'errors' if it is given, and raise FileNotFoundError otherwise.
+
+	_check_file_types(files)
+
+	existing_files = []
+
+	for filename in files:
+		if os.path.isfile(filename):
+			existing_files.append(filename)
+		elif errors is None:
 			raise FileNotFoundError(filename)
-		with open(filename, encoding="UTF-8") as fp:
-			contents = fp.read()
-			# Unfold lines ending with \
-			contents = re.sub(r"\\\s*\n", ' ', contents)
-			parsed_requirements, comments = parse_requirements(contents.splitlines())
-		all_parsed_requirements.extend(parsed_requirements)
-		all_comments.extend(comments)
+		else:
+			errors.append(RequirementsFileError(filename, None, "File not found"))
+
+	return existing_files
+
+
+# The start of a bzip2 stream: 'BZh', the block size ('1' to '9'),
+# and the magic number of either the first block or the end of the (empty) stream.
+_BZIP2_HEADERS = tuple(
+		f"BZh{block_size}".encode("ASCII") + magic
+		for block_size in range(1, 10)
+		for magic in (b"1AY&SY", b"\x17rE8P\x90")
+		)
+
+# File extension, possible magic bytes, and the module used to decompress the file.
+_COMPRESSION_FORMATS = (
+		(".gz", (b"\x1f\x8b", ), "gzip"),
+		(".bz2", _BZIP2_HEADERS, "bz2"),
+		(".xz", (b"\xfd7zXZ\x00", ), "lzma"),
+		)
+
+
+@contextlib.contextmanager
+def _open_requirements_file(filename: str) -> Iterator[IO[bytes]]:
+	"""
+	Open a requirements file in binary mode, decompressing it on the fly
+	if it is compressed with :mod:`gzip`, :mod:`bz2` or :mod:`lzma`.
+
+	Compressed files are recognised by their file extension or magic bytes.
+
+	:param filename:
+	"""
+
+	with open(filename, "rb") as fp:
+		header = fp.read(10)
+		fp.seek(0)
+
+		for extension, magic, module_name in _COMPRESSION_FORMATS:
+			if filename.endswith(extension) or header.startswith(magic):
+				with importlib.import_module(module_name).open(fp, "rb") as decompressed_fp:
+					yield decompressed_fp
+				return
+
+		yield fp
+
+
+def _iter_logical_lines(lines: Iterable[bytes]) -> Iterator[Tuple[int, bytes]]:
+	"""
+	Iterate over the logical lines in a requirements file, unfolding lines which end with ``\\``.
+
+	A leading UTF-8 byte order mark is removed, and ``\\n``, ``\\r\\n`` and ``\\r`` line endings are supported.
+
+	:param lines: The contents of the file, as returned by iterating over a file opened in binary mode.
+
+	:return: An iterator of 2-element tuples giving the (1-based) number of the first physical line
+		each logical line starts on, and the logical line itself.
+	"""
+
+	continued: List[bytes] = []
+	start_lineno = 0
+
+	# Iterating over a binary file only splits on '\n', so lone '\r' line endings are split here.
+	physical_lines = itertools.chain.from_iterable(map(bytes.splitlines, lines))
+
+	for lineno, line in enumerate(physical_lines, start=1):
+		if lineno == 1 and line.startswith(codecs.BOM_UTF8):
+			line = line[len(codecs.BOM_UTF8):]
+
+		stripped_line = line.rstrip()
+
+		if stripped_line.endswith(b'\\'):
+			if not continued:
+				start_lineno = lineno
+			continued.append(stripped_line[:-1])
+		elif continued:
+			continued.append(line)
+			yield start_lineno, b' '.join(continued)
+			continued = []
+		else:
+			yield lineno, line
+
+	if continued:
+		yield start_lineno, b' '.join(continued)
+
+
+def _is_space_before(line: AnyStr, pos: int) -> bool:
+	"""
+	Returns whether the character before index ``pos`` of ``line`` is whitespace.
+
+	For :class:`bytes`, this also recognises non-ASCII whitespace (such as a no-break space) encoded as UTF-8,
+	to match :meth:`str.isspace`.
+
+	:param line:
+	:param pos:
+	"""
+
+	previous = line[pos - 1:pos]
+
+	if previous.isspace():
+		return True
+	elif isinstance(line, bytes) and previous >= b'\x80':
+		# The last byte of a multi-byte character. UTF-8 characters are at most four bytes long.
+		return line[max(pos - 4, 0):pos].decode("UTF-8", errors="replace")[-1:].isspace()
+
+	return False
+
+
+def _split_requirement_line(line: AnyStr) -> Tuple[AnyStr, AnyStr]:
+	"""
+	Split ``line`` into the requirement itself and any trailing pip options, discarding any comment.
+
+	This takes time linear in the length of the line, however many
+	``#``, ``-`` or whitespace characters it contains.
+
+	:param line: A logical line from a requirements file, which is not a comment or pip option.
+
+	:return: The requirement, and the options (which may be empty).
+	"""
+
+	if isinstance(line, bytes):
+		hash_char, dash_char = b'#', b'-'
+	else:
+		hash_char, dash_char = '#', '-'
+
+	# Strip comments from end of line. A comment starts with a '#' at the
+	# start of the line or preceded by whitespace (so URL fragments are kept).
+	pos = line.find(hash_char)
+	while pos != -1:
+		if pos == 0 or _is_space_before(line, pos):
+			line = line[:pos]
+			break
+		pos = line.find(hash_char, pos + 1)
+
+	# Split off options for pip (e.g. --hash) from the end of the line.
+	# An option is '-' or '--' preceded by whitespace and followed by an ASCII letter.
+	pos = line.find(dash_char)
+	while pos != -1:
+		if pos != 0 and _is_space_before(line, pos):
+			option_start = pos + 2 if line[pos + 1:pos + 2] == dash_char else pos + 1
+			option_char = line[option_start:option_start + 1]
+			if option_char.isalpha() and option_char.isascii():
+				return line[:pos].rstrip(), line[pos:]
+		pos = line.find(dash_char, pos + 1)
+
+	return line.rstrip(), line[:0]
+
+
+def _requirement_slice(line: AnyStr) -> AnyStr:
+	"""
+	Returns the part of ``line`` containing the requirement itself,
+	without any trailing comment or pip options.
+
+	:param line: A logical line from a requirements file, which is not a comment or pip option.
+	"""
+
+	return _split_requirement_line(line)[0]
+
+
+class PipOption(NamedTuple):
+	"""
+	An option for pip in a requirements file, such as ``--hash=sha256:...`` or ``--index-url <url>``.
+	"""
+
+	#: The name of the option, including leading dashes (e.g. ``--hash``).
+	name: str
+
+	#: The option's value, or :py:obj:`None` for flags such as ``--pre``.
+	value: Optional[str]
+
+
+def _parse_options(text: str) -> Tuple[PipOption, ...]:
+	"""
+	Parse pip options, such as the part of a requirement line after the requirement itself.
+
+	:param text:
+	"""
+
+	options = []
+	tokens = text.split()
+	idx = 0
+
+	while idx < len(tokens):
+		token = tokens[idx]
+		idx += 1
+
+		if token.startswith("--") and '=' in token:
+			name, value = token.split('=', 1)
+			options.append(PipOption(sys.intern(name), value))
+		elif idx < len(tokens) and not tokens[idx].startswith('-'):
+			options.append(PipOption(sys.intern(token), tokens[idx]))
+			idx += 1
+		else:
+			options.append(PipOption(sys.intern(token), None))
+
+	return tuple(options)
+
+
+def _iter_requirements(
+		logical_lines: Iterable[Tuple[int, bytes]],
+		comments: List[str],
+		filename: str,
+		global_options: Optional[List[PipOption]] = None,
+		errors: Optional[List[RequirementsFileError]] = None,
+		) -> Iterator[Tuple[int, Requirement, Tuple[PipOption, ...]]]:
+	"""
+	Parse the logical lines of a requirements file, read in binary mode.
+
+	Only the requirement portion of each line is decoded before being handed to :mod:`packaging`.
+
+	:param logical_lines: The output of :func:`~._iter_logical_lines`.
+	:param comments: List to append commented lines to.
+	:param filename: The name of the requirements file, for error messages.
+	:param global_options: If given, pip options on their own lines are appended to this list,
+		and the options following each requirement are parsed.
+	:param errors: If given, invalid lines are recorded in this list and skipped, rather than raising an error.
+
+	:return: An iterator of 3-element tuples giving the line number of each requirement, the requirement,
+		and its options (which are always empty if ``global_options`` is :py:obj:`None`).
+	"""
+
+	for lineno, line in logical_lines:
+		try:
+			stripped_line = line.lstrip()
+			if stripped_line[:1] >= b'\x80':
+				# bytes.lstrip() only removes ASCII whitespace.
+				stripped_line = stripped_line.decode("UTF-8").lstrip().encode("UTF-8")
+
+			if stripped_line.startswith(b'#'):
+				comments.append(line.decode("UTF-8"))
+				continue
+			elif stripped_line.startswith(b'-'):
+				# Likely an argument to pip from a requirements.txt file intended for pip
+				# (e.g. from pip-compile)
+				if global_options is not None:
+					option_text = _split_requirement_line(b' ' + stripped_line)[1]
+					global_options.extend(_parse_options(option_text.decode("UTF-8")))
+				continue
+			elif not stripped_line:
+				continue
+
+			requirement_text, option_text = _split_requirement_line(stripped_line)
+			req = Requirement(requirement_text.decode("UTF-8").rstrip())
+			req.name = canonicalize_name(req.name)
+
+			options: Tuple[PipOption, ...] = ()
+			if global_options is not None and option_text:
+				options = _parse_options(option_text.decode("UTF-8"))
+
+		except (InvalidRequirement, UnicodeDecodeError) as e:
+			if errors is not None:
+				errors.append(RequirementsFileError(filename, lineno, str(e)))
+				continue
+			elif isinstance(e, InvalidRequirement):
+				raise InvalidRequirement(f"{filename}:{lineno}: {e}") from e
+			raise
+
+		yield lineno, req, options
+
+
+def load_requirements_files(
+		files: List[str],
+		errors: Optional[List[RequirementsFileError]] = None,
+		) -> Tuple[List[Requirement], List[str]]:
+	"""
+	Load the given requirements files.
+
+	:param files:
+	:param errors: If given, missing files and invalid lines are recorded in this list and skipped,
+		rather than raising an error for the first one.
+
+	:return: The requirements, and a list of commented lines.
+	"""
+
+	all_parsed_requirements: List[Requirement] = []
+	all_comments: List[str] = []
+
+	for filename in _check_files(files, errors):
+		with _open_requirements_file(filename) as fp:
+			requirements = _iter_requirements(_iter_logical_lines(fp), all_comments, filename, None, errors)
+			all_parsed_requirements.extend(req for _, req, _ in requirements)
+
 	return all_parsed_requirements, all_comments
 
 
+# The text between the name and URL of a direct reference, which differs between versions of packaging.
+_URL_PREFIX = str(Requirement("a@ https://a"))[1:-len("https://a")]
+
+# The name, extras, specifier, URL and marker of a requirement, as stored in a ParsedRequirement.
+_RequirementFields = Tuple[str, Tuple[str, ...], str, Optional[str], str]
+
+
+def _requirement_fields(requirement: Requirement) -> _RequirementFields:
+	marker = str(requirement.marker) if requirement.marker is not None else ''
+	extras = tuple(sorted(requirement.extras))
+	return canonicalize_name(requirement.name), extras, str(requirement.specifier), requirement.url, marker
+
+
+class ParsedRequirement:
+	"""
+	Compact record of a :pep:`508` requirement read from a requirements file.
+
+	Only the components of the requirement are stored, as strings.
+	The corresponding :class:`packaging.requirements.Requirement` is constructed
+	when :attr:`~.requirement` is first accessed.
+
+	:param name: The canonical name of the project.
+	:param extras: The requested extras, sorted.
+	:param specifier: The version specifier, e.g. ``>=1.2,<2``.
+	:param url: The URL of a direct reference.
+	:param marker: The environment marker, e.g. ``python_version < "3.8"``.
+	:param filename: The requirements file the requirement was read from.
+	:param lineno: The (1-based) line number of the requirement within ``filename``.
+	:param options: Options for pip given after the requirement, such as ``--hash``.
+	"""
+
+	__slots__ = ("name", "extras", "specifier", "url", "marker", "filename", "lineno", "options", "_requirement")
+
+	name: str
+	extras: Tuple[str, ...]
+	specifier: str
+	url: Optional[str]
+	marker: str
+	filename: Optional[str]
+	lineno: Optional[int]
+	options: Tuple[PipOption, ...]
+
+	def __init__(
+			self,
+			name: str,
+			extras: Tuple[str, ...] = (),
+			specifier: str = '',
+			url: Optional[str] = None,
+			marker: str = '',
+			filename: Optional[str] = None,
+			lineno: Optional[int] = None,
+			options: Tuple[PipOption, ...] = (),
+			) -> None:
+		self.name = sys.intern(name)
+		self.extras = extras
+		self.specifier = specifier
+		self.url = url
+		self.marker = marker
+		self.filename = filename
+		self.lineno = lineno
+		self.options = options
+		self._requirement: Optional[Requirement] = None
+
+	@classmethod
+	def from_requirement(
+			cls,
+			requirement: Requirement,
+			filename: Optional[str] = None,
+			lineno: Optional[int] = None,
+			options: Tuple[PipOption, ...] = (),
+			) -> "ParsedRequirement":
+		"""
+		Construct a :class:`~.ParsedRequirement` from a :class:`packaging.requirements.Requirement`.
+
+		The requirement object itself is not retained.
+
+		:param requirement:
+		:param filename: The requirements file the requirement was read from.
+		:param lineno: The (1-based) line number of the requirement within ``filename``.
+		:param options: Options for pip given after the requirement, such as ``--hash``.
+		"""
+
+		return cls(*_requirement_fields(requirement), filename, lineno, options)
+
+	@property
+	def hashes(self) -> Tuple[str, ...]:
+		"""
+		The values of any ``--hash`` options given after the requirement, e.g. ``sha256:abc...``.
+		"""
+
+		return tuple(option.value for option in self.options if option.name == "--hash" and option.value)
+
+	@property
+	def requirement(self) -> Requirement:
+		"""
+		The requirement as a :class:`packaging.requirements.Requirement`.
+
+		This is constructed on first access and then reused.
+		"""
+
+		if self._requirement is None:
+			self._requirement = Requirement(str(self))
+		return self._requirement
+
+	def __str__(self) -> str:
+		# Matches the output of str(packaging.requirements.Requirement)
+		parts = [self.name]
+
+		if self.extras:
+			parts.append(f"[{','.join(self.extras)}]")
+
+		if self.specifier:
+			parts.append(self.specifier)
+
+		if self.url:
+			parts.append(f"{_URL_PREFIX}{self.url}")
+			if self.marker:
+				parts.append(' ')
+
+		if self.marker:
+			parts.append(f"; {self.marker}")
+
+		return ''.join(parts)
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}({str(self)!r})>"
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, ParsedRequirement):
+			return str(self) == str(other)
+		return NotImplemented
+
+	def __hash__(self) -> int:
+		return hash(str(self))
+
+
+#: The minimum number of logical lines in a requirements file for it to be parsed in parallel,
+#: when that is enabled. Smaller files are always parsed serially.
+PARALLEL_THRESHOLD = 20000
+
+# The number of logical lines in each chunk handed to a worker when parsing in parallel.
+_PARALLEL_CHUNK_SIZE = 5000
+
+
+# The requirements, comments, options and errors found in a chunk of a requirements file.
+_ChunkResult = Tuple[
+		List[Tuple[_RequirementFields, int, Tuple[PipOption, ...]]],
+		List[str],
+		Optional[List[PipOption]],
+		Optional[List[RequirementsFileError]],
+		]
+
+
+def _parse_chunk(
+		chunk: List[Tuple[int, bytes]],
+		filename: str,
+		capture_options: bool,
+		collect_errors: bool,
+		) -> _ChunkResult:
+	# Parse part of a requirements file in a worker.
+	# The requirements are returned as tuples of strings rather than Requirement objects,
+	# as those are about as slow to unpickle in the parent process as they are to parse.
+
+	comments: List[str] = []
+	global_options: Optional[List[PipOption]] = [] if capture_options else None
+	errors: Optional[List[RequirementsFileError]] = [] if collect_errors else None
+
+	requirements = [
+			(_requirement_fields(req), lineno, options)
+			for lineno, req, options in _iter_requirements(chunk, comments, filename, global_options, errors)
+			]
+
+	return requirements, comments, global_options, errors
+
+
+def _iter_chunks(logical_lines: Iterator[Tuple[int, bytes]]) -> Iterator[List[Tuple[int, bytes]]]:
+	while True:
+		chunk = list(itertools.islice(logical_lines, _PARALLEL_CHUNK_SIZE))
+		if not chunk:
+			return
+		yield chunk
+
+
+def _iter_requirements_parallel(
+		logical_lines: Iterator[Tuple[int, bytes]],
+		comments: List[str],
+		filename: str,
+		global_options: Optional[List[PipOption]],
+		errors: Optional[List[RequirementsFileError]],
+		workers: int,
+		) -> Iterator[ParsedRequirement]:
+	"""
+	Parse the logical lines of a requirements file, splitting them into chunks which are parsed in parallel.
+
+	Chunks are parsed in a process pool, or in a thread pool on free-threaded builds of CPython.
+	Only a few chunks per worker are read ahead of the requirements being consumed.
+	Requirements, comments, options and errors are returned in their original order.
+
+	:param logical_lines: The output of :func:`~._iter_logical_lines`.
+	:param comments: List to append commented lines to.
+	:param filename: The name of the requirements file.
+	:param global_options: If given, pip options on their own lines are appended to this list,
+		and the options following each requirement are parsed.
+	:param errors: If given, invalid lines are recorded in this list and skipped, rather than raising an error.
+	:param workers: The number of workers to parse chunks in.
+	"""
+
+	executor_type: Type[Executor]
+	if getattr(sys, "_is_gil_enabled", lambda: True)():
+		executor_type = ProcessPoolExecutor
+	else:
+		executor_type = ThreadPoolExecutor
+
+	with executor_type(max_workers=workers) as executor:
+		pending: Deque["Future[_ChunkResult]"] = collections.deque()
+		chunks = _iter_chunks(logical_lines)
+
+		while True:
+			for chunk in itertools.islice(chunks, 2 * workers - len(pending)):
+				future = executor.submit(_parse_chunk, chunk, filename, global_options is not None, errors is not None)
+				pending.append(future)
+
+			if not pending:
+				return
+
+			requirements, chunk_comments, chunk_options, chunk_errors = pending.popleft().result()
+			comments.extend(chunk_comments)
+			if global_options is not None and chunk_options is not None:
+				global_options.extend(chunk_options)
+			if errors is not None and chunk_errors is not None:
+				errors.extend(chunk_errors)
+
+			for fields, lineno, options in requirements:
+				yield ParsedRequirement(*fields, filename, lineno, options)
+
+
+def _iter_parsed_requirements(
+		fp: IO[bytes],
+		comments: List[str],
+		filename: str,
+		global_options: Optional[List[PipOption]] = None,
+		errors: Optional[List[RequirementsFileError]] = None,
+		parallel: bool = False,
+		) -> Iterator[ParsedRequirement]:
+	"""
+	Parse a requirements file into :class:`~.ParsedRequirement` records.
+
+	:param fp: The file, opened in binary mode.
+	:param comments: List to append commented lines to.
+	:param filename: The name of the requirements file.
+	:param global_options: If given, pip options on their own lines are appended to this list,
+		and the options following each requirement are parsed.
+	:param errors: If given, invalid lines are recorded in this list and skipped, rather than raising an error.
+	:param parallel: Whether to parse the file in parallel if it has at least
+		:py:data:`~.PARALLEL_THRESHOLD` logical lines.
+	"""
+
+	logical_lines = _iter_logical_lines(fp)
+	workers = os.cpu_count() or 1
+
+	if parallel and workers > 1:
+		# Only read as much of the file as is needed to decide whether to parse it in parallel.
+		head = list(itertools.islice(logical_lines, PARALLEL_THRESHOLD))
+		if len(head) == PARALLEL_THRESHOLD:
+			all_lines = itertools.chain(head, logical_lines)
+			yield from _iter_requirements_parallel(all_lines, comments, filename, global_options, errors, workers)
+			return
+		logical_lines = iter(head)
+
+	for lineno, req, options in _iter_requirements(logical_lines, comments, filename, global_options, errors):
+		yield ParsedRequirement.from_requirement(req, filename, lineno, options)
+
+
+def _load_parsed_requirements(
+		files: List[str],
+		parallel: bool,
+		global_options: Optional[List[PipOption]] = None,
+		errors: Optional[List[RequirementsFileError]] = None,
+		) -> Tuple[List[ParsedRequirement], List[str]]:
+	# Shared implementation of load_parsed_requirements(), load_requirements_with_options() and the hook
+
+	all_parsed_requirements: List[ParsedRequirement] = []
+	all_comments: List[str] = []
+
+	for filename in _check_files(files, errors):
+		with _open_requirements_file(filename) as fp:
+			requirements = _iter_parsed_requirements(fp, all_comments, filename, global_options, errors, parallel)
+			all_parsed_requirements.extend(requirements)
+
+	return all_parsed_requirements, all_comments
+
+
+def load_parsed_requirements(
+		files: List[str],
+		parallel: bool = False,
+		) -> Tuple[List[ParsedRequirement], List[str]]:
+	"""
+	Load the given requirements files as compact :class:`~.ParsedRequirement` records.
+
+	This is a lower-memory alternative to :func:`~.load_requirements_files`
+	which also records where each requirement was declared.
+
+	:param files:
+	:param parallel: Whether to split large files into chunks which are parsed in parallel.
+		Files with fewer than :py:data:`~.PARALLEL_THRESHOLD` lines are always parsed serially.
+
+	:return: The requirements, and a list of commented lines.
+	"""
+
+	return _load_parsed_requirements(files, parallel)
+
+
+def load_requirements_with_options(
+		files: List[str],
+		parallel: bool = False,
+		) -> Tuple[List[ParsedRequirement], List[PipOption], List[str]]:
+	"""
+	Load the given requirements files, together with the options for pip they contain.
+
+	Options following a requirement (such as ``--hash``) are stored in
+	:attr:`ParsedRequirement.options <.ParsedRequirement.options>`, and options on their own line
+	(such as ``--index-url``) are returned separately, in the order they appear in the files.
+	This is done in the same pass over each file as parsing the requirements.
+
+	:param files:
+	:param parallel: Whether to split large files into chunks which are parsed in parallel.
+		Files with fewer than :py:data:`~.PARALLEL_THRESHOLD` lines are always parsed serially.
+
+	:return: The requirements, the options on their own line, and a list of commented lines.
+	"""
+
+	global_options: List[PipOption] = []
+	requirements, comments = _load_parsed_requirements(files, parallel, global_options)
+	return requirements, global_options, comments
+
+
+def _iter_groups(
+		groups: Dict[Optional[str], List[str]],
+		parallel: bool,
+		errors: Optional[List[RequirementsFileError]] = None,
+		) -> Iterator[Tuple[Optional[str], List[ParsedRequirement]]]:
+	"""
+	Load the requirements for each group of requirements files in turn, parsing each distinct file only once.
+
+	The requirements from a file used by several groups are kept until the last of those groups has been loaded.
+
+	:param groups: Mapping of optional dependency groups to their requirements files,
+		with the main dependencies under :py:obj:`None`.
+	:param parallel: Whether to split large files into chunks which are parsed in parallel.
+	:param errors: If given, missing files and invalid lines are recorded in this list and skipped,
+		rather than raising an error for the first one.
+
+	:return: An iterator of 2-element tuples giving each group and its requirements.
+	"""
+
+	for files in groups.values():
+		_check_file_types(files)
+
+	remaining_uses = collections.Counter(itertools.chain.from_iterable(groups.values()))
+	loaded: Dict[str, List[ParsedRequirement]] = {}
+
+	for group, files in groups.items():
+		requirements: List[ParsedRequirement] = []
+
+		for filename in files:
+			if filename not in loaded:
+				loaded[filename] = _load_parsed_requirements([filename], parallel, errors=errors)[0]
+			requirements.extend(loaded[filename])
+
+			remaining_uses[filename] -= 1
+			if not remaining_uses[filename]:
+				del loaded[filename]
+
+		yield group, requirements
+
+
+def validate_requirements(
+		files: List[str],
+		optional_dependencies: Optional[Dict[str, List[str]]] = None,
+		parallel: bool = False,
+		) -> None:
+	"""
+	Check that the given requirements files exist and only contain valid requirements.
+
+	Unlike :func:`~.load_requirements_files`, this does not stop at the first problem.
+	All files are checked in a single pass, and all problems are reported together.
+
+	:param files: The requirements files for the main dependencies.
+	:param optional_dependencies: Mapping of optional dependency groups to their requirements files.
+	:param parallel: Whether to split large files into chunks which are parsed in parallel.
+
+	:raises RequirementsValidationError: If any problems were found.
+	"""
+
+	groups: Dict[Optional[str], List[str]] = {None: files}
+	if optional_dependencies is not None:
+		groups.update(optional_dependencies)
+
+	errors: List[RequirementsFileError] = []
+	for _ in _iter_groups(groups, parallel, errors):
+		pass
+
+	if errors:
+		raise RequirementsValidationError(errors)
+
+
+class IndexEntry(NamedTuple):
+	"""
+	An entry in a :class:`~.RequirementIndex`.
+	"""
+
+	#: The optional dependency group the requirement belongs to, or :py:obj:`None` for the main dependencies.
+	group: Optional[str]
+
+	#: The requirement, including the file and line it was declared on.
+	requirement: ParsedRequirement
+
+
+class RequirementIndex:
+	"""
+	Index of requirements across a project's dependencies and optional dependency groups,
+	keyed by canonical project name.
+
+	The main dependencies are stored under the group :py:obj:`None`.
+
+	Lookups by name and by group take constant time.
+	The index can be pickled, for example to cache it alongside the output of
+	:func:`~.requirements_fingerprint` for the same files.
+	"""
+
+	def __init__(self) -> None:
+		self._by_name: Dict[str, List[IndexEntry]] = {}
+		self._by_group: Dict[Optional[str], Dict[str, List[ParsedRequirement]]] = {}
+
+	@classmethod
+	def from_files(
+			cls,
+			files: List[str],
+			optional_dependencies: Optional[Dict[str, List[str]]] = None,
+			parallel: bool = False,
+			) -> "RequirementIndex":
+		"""
+		Construct an index from the given requirements files.
+
+		Each distinct file is only parsed once, even if it is used by several groups.
+
+		:param files: The requirements files for the main dependencies.
+		:param optional_dependencies: Mapping of optional dependency groups to their requirements files.
+		:param parallel: Whether to split large files into chunks which are parsed in parallel.
+		"""
+
+		groups: Dict[Optional[str], List[str]] = {None: files}
+		if optional_dependencies is not None:
+			groups.update(optional_dependencies)
+
+		index = cls()
+
+		for group, requirements in _iter_groups(groups, parallel):
+			# Groups without any requirements are still known to the index.
+			index._by_group.setdefault(group, {})
+			for requirement in requirements:
+				index.add(group, requirement)
+
+		return index
+
+	def add(self, group: Optional[str], requirement: ParsedRequirement) -> None:
+		"""
+		Add a requirement to the index.
+
+		:param group: The optional dependency group the requirement belongs to,
+			or :py:obj:`None` for the main dependencies.
+		:param requirement:
+		"""
+
+		self._by_name.setdefault(requirement.name, []).append(IndexEntry(group, requirement))
+		self._by_group.setdefault(group, {}).setdefault(requirement.name, []).append(requirement)
+
+	@property
+	def groups(self) -> List[Optional[str]]:
+		"""
+		The groups in the index, in the order they were added.
+		"""
+
+		return list(self._by_group)
+
+	def __contains__(self, name: object) -> bool:
+		return isinstance(name, str) and canonicalize_name(name) in self._by_name
+
+	def __getitem__(self, name: str) -> List[IndexEntry]:
+		"""
+		Returns all entries for the given project, across all groups.
+
+		:param name: The project name, which need not be normalized.
+		"""
+
+		return self._by_name[canonicalize_name(name)]
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._by_name)
+
+	def __len__(self) -> int:
+		return len(self._by_name)
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}({len(self)} projects in {len(self._by_group)} groups)>"
+
+	def groups_for(self, name: str) -> Set[Optional[str]]:
+		"""
+		Returns the groups which require the given project.
+
+		:param name: The project name, which need not be normalized.
+		"""
+
+		return {entry.group for entry in self._by_name.get(canonicalize_name(name), ())}
+
+	def names(self, group: Optional[str]) -> Set[str]:
+		"""
+		Returns the canonical names of the projects required by the given group.
+
+		:param group:
+		"""
+
+		return set(self._group(group))
+
+	def requirements(self, group: Optional[str], name: str) -> List[ParsedRequirement]:
+		"""
+		Returns the requirements for the given project within the given group.
+
+		:param group:
+		:param name: The project name, which need not be normalized.
+		"""
+
+		return list(self._group(group).get(canonicalize_name(name), ()))
+
+	def specifier(self, group: Optional[str], name: str) -> SpecifierSet:
+		"""
+		Returns the effective version specifier for the given project within the given group.
+
+		This combines the specifiers of all requirements for the project in that group,
+		regardless of their markers.
+
+		:param group:
+		:param name: The project name, which need not be normalized.
+		"""
+
+		specifier = SpecifierSet()
+		for requirement in self.requirements(group, name):
+			specifier &= requirement.specifier
+		return specifier
+
+	def union(self, *groups: Optional[str]) -> Set[str]:
+		"""
+		Returns the canonical names of the projects required by any of the given groups.
+
+		:param groups:
+		"""
+
+		return set().union(*map(self.names, groups))
+
+	def intersection(self, *groups: Optional[str]) -> Set[str]:
+		"""
+		Returns the canonical names of the projects required by all of the given groups.
+
+		:param groups:
+		"""
+
+		if not groups:
+			return set()
+		return self.names(groups[0]).intersection(*map(self.names, groups[1:]))
+
+	def difference(self, group: Optional[str], *others: Optional[str]) -> Set[str]:
+		"""
+		Returns the canonical names of the projects required by ``group`` but by none of the ``others``.
+
+		:param group:
+		:param others:
+		"""
+
+		return self.names(group).difference(*map(self.names, others))
+
+	def _group(self, group: Optional[str]) -> Dict[str, List[ParsedRequirement]]:
+		if group not in self._by_group:
+			raise KeyError(f"Unknown group {group!r}")
+		return self._by_group[group]
+
+
+_FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+
+def _fingerprint_files(digest: "hashlib._Hash", files: List[str]) -> None:
+	# Feed the name, size and contents of each file into ``digest``.
+	# Each field is length-prefixed so adjacent fields cannot run together.
+
+	_check_files(files)
+
+	for filename in files:
+		encoded_filename = filename.encode("UTF-8")
+		digest.update(len(encoded_filename).to_bytes(8, "big"))
+		digest.update(encoded_filename)
+		with open(filename, "rb") as fp:
+			digest.update(os.fstat(fp.fileno()).st_size.to_bytes(8, "big"))
+			for chunk in iter(lambda: fp.read(_FINGERPRINT_CHUNK_SIZE), b''):
+				digest.update(chunk)
+
+
+def requirements_fingerprint(
+		files: List[str],
+		optional_dependencies: Optional[Dict[str, List[str]]] = None,
+		) -> str:
+	"""
+	Compute a digest of the given requirements files without parsing them.
+
+	The digest covers the name, size and contents of each file, so it can be compared with
+	a previously stored value to cheaply determine whether the requirements may have changed.
+
+	:param files:
+	:param optional_dependencies: Mapping of optional dependency groups to their requirements files.
+		If given, these are included in the digest too.
+
+	:return: The hexadecimal SHA-256 digest.
+	"""
+
+	digest = hashlib.sha256()
+	_fingerprint_files(digest, files)
+
+	if optional_dependencies is not None:
+		for feature_name in sorted(optional_dependencies):
+			digest.update(f"\0[{feature_name}]\0".encode("UTF-8"))
+			_fingerprint_files(digest, optional_dependencies[feature_name])
+
+	return digest.hexdigest()
+
+
+def _requirement_sort_key(requirement: ParsedRequirement) -> Tuple[str, Tuple[str, ...], str, str]:
+	# Sort by canonical name, extras and marker, then by the full normalized string
+	# (which brings in the specifier and URL) so that the order is total.
+	return requirement.name, requirement.extras, requirement.marker, str(requirement)
+
+
+def _format_requirements(requirements: List[ParsedRequirement], canonical_order: bool = False) -> List[str]:
+	"""
+	Convert requirements to strings for the project metadata.
+
+	:param requirements:
+	:param canonical_order: Whether to sort the requirements into a canonical order,
+		rather than the order they appear in the files.
+	"""
+
+	if canonical_order:
+		requirements = sorted(requirements, key=_requirement_sort_key)
+	return [str(r) for r in requirements]
+
+
+# Marker variables recorded in the Python version tables.
+# Other variables, such as 'platform_release', are evaluated but vary too much between machines to record.
+_TABLE_ENVIRONMENT_KEYS = (
+		"implementation_name",
+		"os_name",
+		"platform_machine",
+		"platform_python_implementation",
+		"platform_system",
+		"sys_platform",
+		)
+
+_PYTHON_VERSION_RE = re.compile(r"\d+\.\d+(\.\d+)?")
+
+
+def _full_python_versions(python_version: str, marker: str) -> List[str]:
+	"""
+	Returns the full Python versions to evaluate ``marker`` at for ``python_version``.
+
+	A version in the form ``X.Y`` covers all of its patch releases.
+	A comparison with a version can only have different results for two of those releases
+	if the version lies between them. A bare ``X.Y`` (or ``X.Y.0``) lies between ``X.Y.0`` and ``X.Y.1``,
+	and ``X.Y.Z`` lies between ``X.Y.Z-1`` and ``X.Y.Z+1``, so the marker is evaluated at those releases.
+
+	:param python_version: A Python version in the form ``X.Y`` or ``X.Y.Z``.
+	:param marker:
+	"""
+
+	if python_version.count('.') > 1:
+		return [python_version]
+
+	patches = {0, 1}
+	for match in re.finditer(rf"(?<![\d.]){re.escape(python_version)}\.(\d+)", marker):
+		patch = int(match.group(1))
+		patches.update({max(patch - 1, 0), patch, patch + 1})
+
+	return [f"{python_version}.{patch}" for patch in sorted(patches)]
+
+
+def python_version_tables(
+		dependencies: Iterable[str],
+		optional_dependencies: Dict[str, List[str]],
+		python_versions: Iterable[str],
+		) -> Dict[str, Any]:
+	"""
+	Determine which requirements apply to each of the given Python versions.
+
+	Each requirement's marker is evaluated with ``python_version`` and ``python_full_version`` set to the
+	Python version, and the other marker variables taken from the current environment.
+	On CPython, ``implementation_version`` is also set to the Python version.
+	Each distinct marker is only evaluated once per version.
+
+	A version in the form ``3.X`` stands for all of its patch releases.
+	If a marker applies to some of them but not others, a full version such as ``3.X.0`` must be given instead.
+
+	:param dependencies: The project's dependencies.
+	:param optional_dependencies: Mapping of optional dependency groups to their requirements.
+		Markers in a group are evaluated with ``extra`` set to the group name.
+	:param python_versions: Python versions in the form ``3.X`` or ``3.X.Y``.
+
+	:return: A mapping with the marker variables used (``environment``) and, for each Python version (``python``),
+		the applicable ``dependencies`` and ``optional-dependencies``, without their markers.
+
+	:raises ValueError: If a version is not in the form ``3.X`` or ``3.X.Y``, or a marker cannot be evaluated
+		for one of the versions.
+	"""
+
+	base_environment = cast(Dict[str, str], dict(default_environment()))
+	is_cpython = base_environment["implementation_name"] == "cpython"
+	evaluated: Dict[Tuple[str, str, str], bool] = {}
+	parsed: Dict[str, Tuple[str, Optional[Marker], str]] = {}
+
+	def split_marker(requirement_string: str) -> Tuple[str, Optional[Marker], str]:
+		# Returns the requirement without its marker, the marker, and the marker as a string.
+		if requirement_string not in parsed:
+			req = Requirement(requirement_string)
+			marker, req.marker = req.marker, None
+			parsed[requirement_string] = (str(req), marker, str(marker))
+		return parsed[requirement_string]
+
+	def evaluate(marker: Marker, marker_string: str, python_version: str, extra: str) -> bool:
+		if not is_cpython and "implementation_version" in marker_string:
+			raise ValueError(
+					f"Cannot evaluate the marker {marker_string!r} for Python {python_version}, "
+					f"as 'implementation_version' is not the Python version on {base_environment['implementation_name']}.",
+					)
+
+		results = set()
+		for full_version in _full_python_versions(python_version, marker_string):
+			environment = dict(base_environment)
+			environment["python_version"] = '.'.join(python_version.split('.')[:2])
+			environment["python_full_version"] = full_version
+			if is_cpython:
+				environment["implementation_version"] = full_version
+			environment["extra"] = extra
+			results.add(marker.evaluate(environment))
+
+		if len(results) > 1:
+			raise ValueError(
+					f"The marker {marker_string!r} applies to some Python {python_version}.x releases but not others. "
+					f"Please give full versions such as '{python_version}.0' instead.",
+					)
+
+		return results.pop()
+
+	def applicable(requirements: Iterable[str], python_version: str, extra: str) -> List[str]:
+		applicable_requirements = []
+		for requirement_string in requirements:
+			requirement, marker, marker_string = split_marker(requirement_string)
+			if marker is None:
+				applicable_requirements.append(requirement)
+				continue
+
+			# Markers which do not use 'extra' have the same result for every group.
+			key = (marker_string, python_version, extra if "extra" in marker_string else '')
+			if key not in evaluated:
+				evaluated[key] = evaluate(marker, marker_string, python_version, extra)
+			if evaluated[key]:
+				applicable_requirements.append(requirement)
+
+		return applicable_requirements
+
+	dependencies = list(dependencies)
+	tables: Dict[str, Any] = {}
+
+	for python_version in python_versions:
+		if _PYTHON_VERSION_RE.fullmatch(python_version) is None:
+			raise ValueError(f"Python versions must be in the form '3.X' or '3.X.Y', not {python_version!r}.")
+
+		tables[python_version] = {
+				"dependencies": applicable(dependencies, python_version, ''),
+				"optional-dependencies": {
+						feature_name: applicable(requirements, python_version, feature_name)
+						for feature_name, requirements in optional_dependencies.items()
+						},
+				}
+
+	return {
+			"environment": {key: base_environment[key] for key in _TABLE_ENVIRONMENT_KEYS},
+			"python": tables,
+			}
+
+
+def _write_python_version_tables(filename: str, tables: Dict[str, Any]) -> None:
+	# Only write the file if it has changed, to avoid needlessly updating its modification time.
+	contents = json.dumps(tables, indent=2, sort_keys=True) + '\n'
+
+	if os.path.isfile(filename):
+		with open(filename, encoding="UTF-8") as fp:
+			if fp.read() == contents:
+				return
+
+	with open(filename, 'w', encoding="UTF-8") as fp:
+		fp.write(contents)
+
+
 class RequirementsMetadataHook(MetadataHookInterface):
 	"""
 	Hatch metadata hook to populate 'project.depencencies' from a ``requirements.txt`` file.
@@ -121,11 +1276,14 @@ class RequirementsMetadataHook(MetadataHookInterface):
 
 	PLUGIN_NAME = "requirements_txt"
 
-	def update(self, metadata: dict) -> None:
+	def _dependency_files(self, metadata: dict) -> Tuple[Optional[List[str]], Optional[Dict[str, List[str]]]]:
 		"""
-		Update the project table's metadata.
+		Determine which requirements files the hook reads, checking the configuration against ``metadata``.
 
-		:param metadata:
+		:param metadata: The project table.
+
+		:return: The requirements files for the dependencies, and the mapping of optional dependency groups
+			to their requirements files. Each is :py:obj:`None` if the hook does not provide them.
 		"""
 
 		# 'filename' is the old way to specify a single requirements file. 'files' is preferred.
@@ -169,8 +1327,6 @@ class RequirementsMetadataHook(MetadataHookInterface):
 						"is deprecated. Please instead use the list 'files'.",
 						DeprecationWarning,
 						)
-			requirements, _ = load_requirements_files(files)
-			metadata["dependencies"] = [str(r) for r in requirements]
 
 		# Also handle optional-dependencies if present
 		optional_dependency_files: Optional[Dict[str, List[str]]] = self.config.get("optional-dependencies", None)
@@ -186,15 +1342,84 @@ class RequirementsMetadataHook(MetadataHookInterface):
 			# Optional dependencies are declared dynamic
 			if "optional-dependencies" in metadata:
 				raise ValueError("'optional-dependencies' is dynamic but already listed in [project].")
-			if optional_dependency_files is None:
-				# optional_dependency_files is probably being set by another plugin.
-				pass
+			# If optional_dependency_files is None, it is probably being set by another plugin.
+
+		return files, optional_dependency_files
+
+	def fingerprint(self, metadata: dict) -> str:
+		"""
+		Compute a digest of the hook's configuration and all requirements files it refers to.
+
+		The requirements files are not parsed.
+		See :func:`~.requirements_fingerprint` for details.
+
+		:param metadata: The project table, as passed to :meth:`~.update`.
+			The configuration is checked in the same way, and the same requirements files are used.
+
+		:return: The hexadecimal SHA-256 digest.
+		"""
+
+		files, optional_dependency_files = self._dependency_files(metadata)
+
+		digest = hashlib.sha256()
+		digest.update(json.dumps(self.config, sort_keys=True, default=str).encode("UTF-8"))
+		digest.update(requirements_fingerprint(files or [], optional_dependency_files).encode("UTF-8"))
+		return digest.hexdigest()
+
+	def update(self, metadata: dict) -> None:
+		"""
+		Update the project table's metadata.
+
+		:param metadata:
+		"""
+
+		parallel: bool = self.config.get("parallel", False)
+		canonical_order: bool = self.config.get("canonical-order", False)
+
+		files, optional_dependency_files = self._dependency_files(metadata)
+
+		# The requirements files to load for each group, with the main dependencies under None.
+		groups: Dict[Optional[str], List[str]] = {}
+
+		if files is not None:
+			groups[None] = files
+
+		if optional_dependency_files is not None:
+			metadata["optional-dependencies"] = {}
+			groups.update(optional_dependency_files)
+
+		# In validation mode, problems in all files are collected and reported together at the end.
+		errors: Optional[List[RequirementsFileError]] = [] if self.config.get("validate", False) else None
+
+		for group, requirements in _iter_groups(groups, parallel, errors):
+			if group is None:
+				metadata["dependencies"] = _format_requirements(requirements, canonical_order)
 			else:
-				optional_deps_result = {}
-				for feature_name, files in optional_dependency_files.items():
-					requirements, _ = load_requirements_files(files)
-					optional_deps_result[feature_name] = [str(r) for r in requirements]
-				metadata["optional-dependencies"] = optional_deps_result
+				metadata["optional-dependencies"][group] = _format_requirements(requirements, canonical_order)
+
+		if errors:
+			raise RequirementsValidationError(errors)
+
+		python_tables: Optional[Dict[str, Any]] = self.config.get("python-tables", None)
+		if python_tables is not None:
+			if "versions" not in python_tables:
+				raise ValueError(
+						"[tool.hatch.metadata.hooks.requirements_txt.python-tables] "
+						"must specify a list of Python 'versions'.",
+						)
+			python_versions = python_tables["versions"]
+			if not isinstance(python_versions, List) or not all(isinstance(v, str) for v in python_versions):
+				raise TypeError(
+						"[tool.hatch.metadata.hooks.requirements_txt.python-tables] 'versions' must be a list of strings, "
+						f"but got {python_versions!r}.",
+						)
+			tables = python_version_tables(
+					metadata.get("dependencies", []),
+					metadata.get("optional-dependencies", {}),
+					python_versions,
+					)
+			tables_filename = python_tables.get("file", "requirements-tables.json")
+			_write_python_version_tables(os.path.join(self.root, tables_filename), tables)
 
 
 @hookimpl
@@ -0,0 +1,83 @@
+# stdlib
+import io
+import os
+import pickle
+import time
+from typing import Callable, Iterator, List
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from hatch_requirements_txt import (
+		PARALLEL_THRESHOLD,
+		ParsedRequirement,
+		_ChunkResult,
+		_iter_logical_lines,
+		_parse_chunk,
+		load_parsed_requirements
+		)
+
+# Parsing in parallel should give a real speedup on machines with at least this many CPUs.
+MIN_CPUS = 4
+
+# Parsing with 4 workers should take less than half as long as parsing serially.
+MIN_SPEEDUP = 2.0
+
+# The work done in the parent process to collect the workers' results must be a small fraction
+# of the work of parsing serially, as it bounds the speedup however many workers there are.
+MAX_PARENT_FRACTION = 0.25
+
+
+def requirement_lines(count: int) -> Iterator[str]:
+	for idx in range(count):
+		yield f"package-{idx}[extra]>={idx % 10}.{idx % 7},<{idx % 10 + 1}; python_version >= '3.{idx % 13}'"
+
+
+def elapsed(func: Callable[[], object]) -> float:
+	start = time.perf_counter()
+	func()
+	return time.perf_counter() - start
+
+
+@pytest.mark.timeout(600)
+@pytest.mark.skipif(
+		not os.environ.get("HATCH_REQUIREMENTS_TXT_BENCHMARK"),
+		reason="Wall-clock benchmark; set HATCH_REQUIREMENTS_TXT_BENCHMARK=1 to run",
+		)
+@pytest.mark.skipif((os.cpu_count() or 1) < MIN_CPUS, reason=f"Requires at least {MIN_CPUS} CPUs")
+def test_parallel_speedup(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_lines(requirement_lines(5 * PARALLEL_THRESHOLD))
+
+	with in_directory(tmp_pathplus):
+		serial_time = elapsed(lambda: load_parsed_requirements(["requirements.txt"]))
+		parallel_time = elapsed(lambda: load_parsed_requirements(["requirements.txt"], parallel=True))
+
+	speedup = serial_time / parallel_time
+	assert speedup >= MIN_SPEEDUP, f"Serial: {serial_time:.2f}s, parallel: {parallel_time:.2f}s"
+
+
+@pytest.mark.timeout(120)
+def test_parallel_parent_overhead():
+	# Compare the work left in the parent process (unpickling each chunk's result and constructing
+	# the records) with parsing serially. This holds regardless of how many CPUs there are.
+	data = '\n'.join(requirement_lines(PARALLEL_THRESHOLD)).encode("UTF-8")
+	lines = list(_iter_logical_lines(io.BytesIO(data)))
+	chunks = [lines[idx:idx + 5000] for idx in range(0, len(lines), 5000)]
+
+	serial_time = elapsed(lambda: [_parse_chunk(chunk, "requirements.txt", False, False) for chunk in chunks])
+
+	pickled_results = [pickle.dumps(_parse_chunk(chunk, "requirements.txt", False, False)) for chunk in chunks]
+	records: List[ParsedRequirement] = []
+
+	def collect() -> None:
+		for pickled_result in pickled_results:
+			result: _ChunkResult = pickle.loads(pickled_result)
+			for fields, lineno, options in result[0]:
+				records.append(ParsedRequirement(*fields, "requirements.txt", lineno, options))
+
+	parent_time = elapsed(collect)
+
+	assert len(records) == PARALLEL_THRESHOLD
+	assert parent_time / serial_time <= MAX_PARENT_FRACTION, f"Serial: {serial_time:.2f}s, parent: {parent_time:.2f}s"
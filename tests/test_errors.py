@@ -1,5 +1,5 @@
 # stdlib
-from typing import Callable
+from typing import IO, Callable, ContextManager, Dict, List, Optional
 
 # 3rd party
 import pytest
@@ -9,6 +9,15 @@ from hatchling.build import build_sdist, build_wheel
 from packaging.requirements import InvalidRequirement
 from packaging.version import Version
 
+# this package
+import hatch_requirements_txt
+from hatch_requirements_txt import (
+		RequirementsFileError,
+		RequirementsMetadataHook,
+		RequirementsValidationError,
+		validate_requirements
+		)
+
 _hatchling_version = Version(importlib_metadata.version("hatchling"))
 hatchling_version = (_hatchling_version.major, _hatchling_version.minor)
 
@@ -356,3 +365,104 @@ def test_no_files_or_filename_deprecation(tmp_pathplus: PathPlus, build_func: Ca
 		),
 	):
 		build_func(dist_dir)
+
+
+@pytest.mark.parametrize("build_func", [build_wheel, build_sdist])
+def test_validate_reports_all_errors(tmp_pathplus: PathPlus, build_func: Callable):
+
+	dist_dir = tmp_pathplus / "dist"
+	dist_dir.maybe_make()
+
+	(tmp_pathplus / "pyproject.toml").write_clean(
+			pyproject_toml.replace(
+					'dynamic = ["dependencies"]',
+					'dynamic = ["dependencies", "optional-dependencies"]',
+					).replace(
+							'files = ["requirements.txt"]',
+							'files = ["requirements.txt", "requirements-missing.txt"]\nvalidate = true\n\n'
+							"[tool.hatch.metadata.hooks.requirements_txt.optional-dependencies]\n"
+							'cli = ["requirements-cli.txt"]\n'
+							'all = ["requirements.txt", "requirements-cli.txt"]',
+							),
+			)
+	(tmp_pathplus / "requirements.txt").write_lines(["Fo???o", "bar", "baz>>1"])
+	(tmp_pathplus / "requirements-cli.txt").write_lines(["colorama", "click[", "# comment"])
+	(tmp_pathplus / "README.md").touch()
+	(tmp_pathplus / "LICENSE").touch()
+	(tmp_pathplus / "demo").maybe_make()
+	(tmp_pathplus / "demo" / "__init__.py").touch()
+
+	with in_directory(tmp_pathplus), pytest.raises(RequirementsValidationError) as excinfo:
+		build_func(dist_dir)
+
+	assert [(e.filename, e.lineno) for e in excinfo.value.errors] == [
+			("requirements.txt", 1),
+			("requirements.txt", 3),
+			("requirements-missing.txt", None),
+			("requirements-cli.txt", 2),
+			]
+	assert str(excinfo.value).startswith("Found 4 errors in requirements files:\nrequirements.txt:1: ")
+	assert "\nrequirements-missing.txt: File not found\n" in str(excinfo.value)
+
+
+def test_validate_requirements(tmp_pathplus: PathPlus):
+
+	(tmp_pathplus / "requirements.txt").write_lines(["Foo", "bar"])
+	(tmp_pathplus / "requirements-cli.txt").write_bytes(b"colorama\ncaf\xe9\n")
+
+	with in_directory(tmp_pathplus):
+		validate_requirements(["requirements.txt"])
+
+		with pytest.raises(RequirementsValidationError, match=r"^Found 2 errors in requirements files:") as excinfo:
+			validate_requirements(["requirements.txt"], {"cli": ["requirements-cli.txt", "requirements-dev.txt"]})
+
+	invalid_line, missing_file = excinfo.value.errors
+	assert invalid_line.filename == "requirements-cli.txt"
+	assert invalid_line.lineno == 2
+	assert "can't decode" in invalid_line.message
+	assert missing_file == RequirementsFileError("requirements-dev.txt", None, "File not found")
+
+
+def test_validate_requirements_shared_files(tmp_pathplus: PathPlus, monkeypatch: pytest.MonkeyPatch):
+	(tmp_pathplus / "requirements.txt").write_lines(["Foo", "b???ar"])
+	(tmp_pathplus / "requirements-cli.txt").write_lines(["colorama"])
+
+	opened = []
+	open_requirements_file = hatch_requirements_txt._open_requirements_file
+
+	def record_open(filename: str) -> ContextManager[IO[bytes]]:
+		opened.append(filename)
+		return open_requirements_file(filename)
+
+	monkeypatch.setattr(hatch_requirements_txt, "_open_requirements_file", record_open)
+
+	groups = {"cli": ["requirements-cli.txt"], "all": ["requirements.txt", "requirements-cli.txt"]}
+
+	with in_directory(tmp_pathplus), pytest.raises(RequirementsValidationError) as excinfo:
+		validate_requirements(["requirements.txt"], groups)
+
+	assert [(e.filename, e.lineno) for e in excinfo.value.errors] == [("requirements.txt", 2)]
+	assert opened == ["requirements.txt", "requirements-cli.txt"]
+
+	opened.clear()
+	config = {"files": ["requirements.txt"], "optional-dependencies": groups, "validate": True}
+	metadata = {"dynamic": ["dependencies", "optional-dependencies"]}
+
+	with in_directory(tmp_pathplus), pytest.raises(RequirementsValidationError) as excinfo:
+		RequirementsMetadataHook(str(tmp_pathplus), config).update(metadata)
+
+	assert [(e.filename, e.lineno) for e in excinfo.value.errors] == [("requirements.txt", 2)]
+	assert opened == ["requirements.txt", "requirements-cli.txt"]
+
+
+@pytest.mark.parametrize(
+		"files, optional_dependencies",
+		[
+				pytest.param("requirements.txt", None, id="files"),
+				pytest.param(["requirements.txt"], {"cli": "requirements-cli.txt"}, id="optional_dependencies"),
+				pytest.param(["requirements.txt", 1], None, id="filename"),
+				],
+		)
+def test_validate_requirements_types(files: List[str], optional_dependencies: Optional[Dict[str, List[str]]]):
+	with pytest.raises(TypeError, match="^Requirements file"):
+		validate_requirements(files, optional_dependencies)
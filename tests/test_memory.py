@@ -0,0 +1,134 @@
+# stdlib
+import gc
+import tracemalloc
+from typing import Callable, Iterator, List, Tuple, TypeVar
+
+# 3rd party
+import pytest
+from coincidence.selectors import not_pypy
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from hatch_requirements_txt import RequirementsMetadataHook, load_requirements_files, parse_requirements
+
+_T = TypeVar("_T")
+
+pytestmark = not_pypy("tracemalloc is not available on PyPy")
+
+# Memory budgets, in bytes per input line.
+#
+# "Peak" is the highest amount of memory allocated at any point during the call,
+# and "retained" is the memory still allocated afterwards (i.e. held by the result).
+# Both are measured relative to the memory allocated before the call.
+#
+# The budgets are roughly twice the usage measured with CPython 3.11 and packaging 26,
+# to allow for differences between Python and packaging versions.
+
+# parse_requirements() on plain lines such as ``package-123>=1.2.3``.
+# Each line becomes a packaging Requirement, which dominates the usage.
+PARSE_PEAK_PER_LINE = 1500
+PARSE_RETAINED_PER_LINE = 1500
+
+# load_requirements_files() on a pip-compile style lockfile with two hashes per requirement,
+# so one line in four is a requirement.
+LOAD_PEAK_PER_LINE = 500
+LOAD_RETAINED_PER_LINE = 450
+
+# RequirementsMetadataHook.update() with the lockfile spread over many optional dependency groups.
+# Only one group's Requirement objects are alive at once, and only strings are retained.
+UPDATE_PEAK_PER_LINE = 150
+UPDATE_RETAINED_PER_LINE = 60
+
+SIZES = [1000, 4000, 16000]
+GROUP_COUNT = 50
+
+
+def measure(func: Callable[[], _T]) -> Tuple[_T, int, int]:
+	"""
+	Call ``func`` and return its result, together with the peak and retained memory usage in bytes.
+	"""
+
+	gc.collect()
+	tracemalloc.start()  # Also resets the peak
+	try:
+		baseline = tracemalloc.get_traced_memory()[0]
+		result = func()
+		gc.collect()
+		current, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	return result, peak - baseline, current - baseline
+
+
+def requirement_lines(count: int) -> Iterator[str]:
+	for idx in range(count):
+		yield f"package-{idx}>={idx % 10}.{idx % 7}.{idx % 13}"
+
+
+def lockfile_lines(count: int) -> Iterator[str]:
+	# pip-compile output, with each requirement taking up four physical lines.
+	for idx in range(count // 4):
+		yield f"package-{idx}=={idx % 10}.{idx % 7}.{idx % 13} \\"
+		yield f"    --hash=sha256:{idx:064x} \\"
+		yield f"    --hash=sha256:{idx + 1:064x}"
+		yield f"    # via project-{idx % 17}"
+
+
+def check_budget(lines: int, peak: int, retained: int, peak_budget: int, retained_budget: int) -> None:
+	assert peak / lines <= peak_budget, f"Peak usage of {peak / lines:.0f} bytes per line"
+	assert retained / lines <= retained_budget, f"Retained usage of {retained / lines:.0f} bytes per line"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parse_requirements_memory(size: int):
+	lines = list(requirement_lines(size))
+
+	(requirements, _), peak, retained = measure(lambda: parse_requirements(lines))
+
+	assert len(requirements) == size
+	check_budget(size, peak, retained, PARSE_PEAK_PER_LINE, PARSE_RETAINED_PER_LINE)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_load_requirements_files_memory(tmp_pathplus: PathPlus, size: int):
+	(tmp_pathplus / "requirements.txt").write_lines(lockfile_lines(size))
+
+	with in_directory(tmp_pathplus):
+		(requirements, comments), peak, retained = measure(lambda: load_requirements_files(["requirements.txt"]))
+
+	assert len(requirements) == size // 4
+	assert len(comments) == size // 4
+	check_budget(size, peak, retained, LOAD_PEAK_PER_LINE, LOAD_RETAINED_PER_LINE)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_update_memory(tmp_pathplus: PathPlus, size: int):
+	lines = list(lockfile_lines(size))
+	group_size = len(lines) // GROUP_COUNT // 4 * 4
+
+	optional_dependencies = {}
+	for group in range(GROUP_COUNT):
+		filename = f"requirements-{group}.txt"
+		(tmp_pathplus / filename).write_lines(lines[group * group_size:(group + 1) * group_size])
+		optional_dependencies[f"group-{group}"] = [filename]
+
+	(tmp_pathplus / "requirements.txt").write_lines(lines[GROUP_COUNT * group_size:])
+
+	config = {"files": ["requirements.txt"], "optional-dependencies": optional_dependencies}
+	hook = RequirementsMetadataHook(str(tmp_pathplus), config)
+
+	def update() -> dict:
+		metadata: dict = {"dynamic": ["dependencies", "optional-dependencies"]}
+		hook.update(metadata)
+		return metadata
+
+	with in_directory(tmp_pathplus):
+		metadata, peak, retained = measure(update)
+
+	all_requirements: List[str] = metadata["dependencies"]
+	for group_requirements in metadata["optional-dependencies"].values():
+		all_requirements.extend(group_requirements)
+
+	assert len(all_requirements) == size // 4
+	check_budget(size, peak, retained, UPDATE_PEAK_PER_LINE, UPDATE_RETAINED_PER_LINE)
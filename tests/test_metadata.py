@@ -1,5 +1,10 @@
 # stdlib
-from typing import Callable, List, Union
+import bz2
+import gzip
+import json
+import lzma
+import pickle
+from typing import IO, Callable, ContextManager, Dict, List, Optional, Union
 
 # 3rd party
 import pkginfo
@@ -8,10 +13,25 @@ from coincidence.regressions import AdvancedDataRegressionFixture
 from domdf_python_tools.paths import PathPlus, in_directory
 from hatchling.__about__ import __version__ as hatchling_version
 from hatchling.build import build_sdist, build_wheel
+from packaging.markers import Marker
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
 # this package
-from hatch_requirements_txt import parse_requirements
+import hatch_requirements_txt
+from hatch_requirements_txt import (
+		ParsedRequirement,
+		PipOption,
+		RequirementIndex,
+		RequirementsMetadataHook,
+		load_parsed_requirements,
+		load_requirements_files,
+		load_requirements_with_options,
+		parse_requirements,
+		python_version_tables,
+		requirements_fingerprint
+		)
 
 pyproject_toml_header = """
 [project]
@@ -385,3 +405,612 @@ crypto = ["requirements-crypto.txt"]
 			"cryptography; extra == 'crypto'",
 			"pyjwt; extra == 'crypto'",
 			]
+
+
+def test_requirements_fingerprint(tmp_pathplus: PathPlus):
+
+	(tmp_pathplus / "requirements.txt").write_lines(["Foo", "bar", "# fizz", "baz>1"])
+	(tmp_pathplus / "requirements-cli.txt").write_lines(["Fo???o"])
+
+	with in_directory(tmp_pathplus):
+		fingerprint = requirements_fingerprint(["requirements.txt"])
+		assert requirements_fingerprint(["requirements.txt"]) == fingerprint
+
+		# The files are not parsed, so invalid requirements don't matter.
+		with_optional = requirements_fingerprint(["requirements.txt"], {"cli": ["requirements-cli.txt"]})
+		assert with_optional != fingerprint
+
+		(tmp_pathplus / "requirements.txt").write_lines(["Foo", "bar", "# fizz", "baz>2"])
+		assert requirements_fingerprint(["requirements.txt"]) != fingerprint
+
+		with pytest.raises(FileNotFoundError, match=r"^requirements-dev\.txt$"):
+			requirements_fingerprint(["requirements-dev.txt"])
+
+
+def test_hook_fingerprint(tmp_pathplus: PathPlus):
+
+	(tmp_pathplus / "requirements.txt").write_lines(["Foo", "bar"])
+	(tmp_pathplus / "requirements-cli.txt").write_lines(["colorama"])
+
+	config = {"files": ["requirements.txt"], "optional-dependencies": {"cli": ["requirements-cli.txt"]}}
+	metadata = {"dynamic": ["dependencies", "optional-dependencies"]}
+
+	with in_directory(tmp_pathplus):
+		fingerprint = RequirementsMetadataHook(str(tmp_pathplus), config).fingerprint(metadata)
+		assert RequirementsMetadataHook(str(tmp_pathplus), dict(config)).fingerprint(metadata) == fingerprint
+
+		(tmp_pathplus / "requirements-cli.txt").write_lines(["colorama", "click"])
+		assert RequirementsMetadataHook(str(tmp_pathplus), config).fingerprint(metadata) != fingerprint
+
+		# The configuration is checked in the same way as when building.
+		with pytest.raises(ValueError, match="when 'optional-dependencies' is not listed in 'project.dynamic'"):
+			RequirementsMetadataHook(str(tmp_pathplus), config).fingerprint({"dynamic": ["dependencies"]})
+
+
+def test_hook_fingerprint_default_file(tmp_pathplus: PathPlus):
+	# The same files are used as when building, including the deprecated default.
+	hook = RequirementsMetadataHook(str(tmp_pathplus), {})
+
+	with in_directory(tmp_pathplus):
+		# Without dynamic dependencies no files are read.
+		hook.fingerprint({"dependencies": ["foo"]})
+
+		with pytest.warns(DeprecationWarning), pytest.raises(FileNotFoundError, match=r"^requirements\.txt$"):
+			hook.fingerprint({"dynamic": ["dependencies"]})
+
+		(tmp_pathplus / "requirements.txt").write_lines(["Foo", "bar"])
+
+		with pytest.warns(DeprecationWarning):
+			fingerprint = hook.fingerprint({"dynamic": ["dependencies"]})
+
+		(tmp_pathplus / "requirements.txt").write_lines(["Foo", "baz"])
+
+		with pytest.warns(DeprecationWarning):
+			assert hook.fingerprint({"dynamic": ["dependencies"]}) != fingerprint
+
+
+def test_load_requirements_files_bytes(tmp_pathplus: PathPlus):
+
+	(tmp_pathplus / "requirements.txt").write_bytes(
+			b"\xef\xbb\xbfFoo\r\n"
+			b"# fizz\r\n"
+			b"   \r\n"
+			b"alembic==1.9.1 \\\r\n"
+			b"    --hash=sha256:a9781ed0979a20341c2cbb56bd22bd8db4fc1913f955e705444bd3a97c59fa32\r\n"
+			b"baz>1  # this is a comment\r\n"
+			b"pip@ https://github.com/pypa/pip/archive/1.3.1.zip#sha1=da9234ee9982d4bbb3c72346a6de940a148ea686\n"
+			b"cafe-lib; python_version >= '3.8' -c constraints.txt  # caf\xc3\xa9"
+			)
+
+	with in_directory(tmp_pathplus):
+		requirements, comments = load_requirements_files(["requirements.txt"])
+
+	assert [r.name for r in requirements] == ["foo", "alembic", "baz", "pip", "cafe-lib"]
+	assert str(requirements[1].specifier) == "==1.9.1"
+	assert requirements[3].url == "https://github.com/pypa/pip/archive/1.3.1.zip#sha1=da9234ee9982d4bbb3c72346a6de940a148ea686"
+	assert str(requirements[4].marker) == 'python_version >= "3.8"'
+	assert comments == ["# fizz"]
+
+
+@pytest.mark.parametrize(
+		"contents",
+		[
+				pytest.param(b"foo\rbar\r# baz\r", id="cr"),
+				pytest.param(b"foo\r\nbar\n# baz", id="mixed"),
+				pytest.param(b"foo \\\r    --hash=sha256:abc\rbar\r# baz", id="cr_continuation"),
+				],
+		)
+def test_load_requirements_files_line_endings(tmp_pathplus: PathPlus, contents: bytes):
+	# Lone '\r' line endings are supported, as when reading the file in text mode
+	(tmp_pathplus / "requirements.txt").write_bytes(contents)
+
+	with in_directory(tmp_pathplus):
+		requirements, comments = load_requirements_files(["requirements.txt"])
+
+	assert [str(r) for r in requirements] == ["foo", "bar"]
+	assert comments == ["# baz"]
+
+
+@pytest.mark.parametrize(
+		"line",
+		[
+				pytest.param("foo\u00a0# caf\u00e9 comment", id="nbsp_comment"),
+				pytest.param("foo\u3000--hash=sha256:abc", id="ideographic_space_option"),
+				pytest.param("foo\u00a0", id="trailing_nbsp"),
+				pytest.param("\u2003foo", id="leading_em_space"),
+				pytest.param("\u00a0# caf\u00e9 comment", id="indented_comment"),
+				],
+		)
+def test_load_requirements_files_unicode_whitespace(tmp_pathplus: PathPlus, line: str):
+	# Non-ASCII whitespace is handled the same as when parsing the decoded line
+	(tmp_pathplus / "requirements.txt").write_text(line, encoding="UTF-8")
+
+	expected = parse_requirements([line])
+
+	with in_directory(tmp_pathplus):
+		requirements, comments = load_requirements_files(["requirements.txt"])
+
+	assert [str(r) for r in requirements] == [str(r) for r in expected[0]]
+	assert comments == expected[1]
+
+
+def test_load_requirements_files_line_numbers(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_bytes(b"foo\rbar\r\n\r\nbaz\nqux\r")
+
+	with in_directory(tmp_pathplus):
+		requirements, _ = load_parsed_requirements(["requirements.txt"])
+
+	assert [(r.name, r.lineno) for r in requirements] == [("foo", 1), ("bar", 2), ("baz", 4), ("qux", 5)]
+
+
+@pytest.mark.parametrize(
+		"requirement",
+		[
+				"foo",
+				"Foo_Bar[Security, socks]>=1.0,<2; python_version < '3.8'",
+				"pip@ https://github.com/pypa/pip/archive/1.3.1.zip#sha1=da9234ee9982d4bbb3c72346a6de940a148ea686",
+				"pip @ https://github.com/pypa/pip/archive/1.3.1.zip ; sys_platform == 'win32'",
+				'numpy==1.19.3; platform_system == "Windows"',
+				],
+		)
+def test_parsed_requirement(requirement: str):
+	req = Requirement(requirement)
+	record = ParsedRequirement.from_requirement(req, "requirements.txt", 3)
+	req.name = record.name
+
+	assert str(record) == str(req)
+	assert record.filename == "requirements.txt"
+	assert record.lineno == 3
+	assert not hasattr(record, "__dict__")
+
+	assert record.requirement == req
+	assert record.requirement is record.requirement
+	assert record == ParsedRequirement.from_requirement(req)
+
+
+def test_load_parsed_requirements(tmp_pathplus: PathPlus):
+
+	(tmp_pathplus / "requirements.txt").write_lines([
+			"Foo",
+			"# fizz",
+			"alembic==1.9.1 \\",
+			"    --hash=sha256:a9781ed0979a20341c2cbb56bd22bd8db4fc1913f955e705444bd3a97c59fa32",
+			"baz[b,a]>1  # this is a comment",
+			])
+	(tmp_pathplus / "requirements-cli.txt").write_lines(["colorama; platform_system == 'Windows'"])
+
+	with in_directory(tmp_pathplus):
+		records, comments = load_parsed_requirements(["requirements.txt", "requirements-cli.txt"])
+
+	assert comments == ["# fizz"]
+	assert [(r.name, r.extras, r.specifier, r.marker, r.filename, r.lineno) for r in records] == [
+			("foo", (), '', '', "requirements.txt", 1),
+			("alembic", (), "==1.9.1", '', "requirements.txt", 3),
+			("baz", ('a', 'b'), ">1", '', "requirements.txt", 5),
+			("colorama", (), '', 'platform_system == "Windows"', "requirements-cli.txt", 1),
+			]
+
+
+@pytest.mark.parametrize("loader", [load_parsed_requirements, load_requirements_with_options])
+def test_load_requirements_parallel(tmp_pathplus: PathPlus, monkeypatch: pytest.MonkeyPatch, loader: Callable):
+	monkeypatch.setattr(hatch_requirements_txt, "PARALLEL_THRESHOLD", 10)
+	monkeypatch.setattr(hatch_requirements_txt, "_PARALLEL_CHUNK_SIZE", 7)
+	monkeypatch.setattr(hatch_requirements_txt.os, "cpu_count", lambda: 4)
+
+	lines = []
+	for idx in range(200):
+		lines.append(f"# package {idx}")
+		lines.append(f"package-{idx}>={idx} \\")
+		lines.append(f"    --hash=sha256:{idx:064x}")
+
+	(tmp_pathplus / "requirements.txt").write_lines(lines)
+	(tmp_pathplus / "requirements-small.txt").write_lines(lines[:27])
+
+	with in_directory(tmp_pathplus):
+		serial = loader(["requirements.txt", "requirements-small.txt"])
+		parallel = loader(["requirements.txt", "requirements-small.txt"], parallel=True)
+
+	def locations(records: List[ParsedRequirement]):
+		return [(r.filename, r.lineno, r.options) for r in records]
+
+	assert parallel[0] == serial[0]
+	assert locations(parallel[0]) == locations(serial[0])
+	assert parallel[1:] == serial[1:]
+	assert len(parallel[0]) == 209
+
+	lines[451] = "package-151>=???"
+	(tmp_pathplus / "requirements.txt").write_lines(lines)
+
+	with in_directory(tmp_pathplus), pytest.raises(InvalidRequirement, match=r"^requirements\.txt:452: "):
+		loader(["requirements.txt"], parallel=True)
+
+
+def test_parallel_hook(tmp_pathplus: PathPlus, monkeypatch: pytest.MonkeyPatch):
+	monkeypatch.setattr(hatch_requirements_txt, "PARALLEL_THRESHOLD", 10)
+	monkeypatch.setattr(hatch_requirements_txt, "_PARALLEL_CHUNK_SIZE", 7)
+	monkeypatch.setattr(hatch_requirements_txt.os, "cpu_count", lambda: 4)
+
+	(tmp_pathplus / "requirements.txt").write_lines([
+			f"Package_{idx}[b,a]>={idx}; python_version < '3.{idx}'" for idx in range(100)
+			])
+	(tmp_pathplus / "requirements-url.txt").write_lines([
+			f"package-{idx} @ https://example.com/{idx}.zip" for idx in range(100)
+			])
+
+	def update(parallel: bool) -> dict:
+		config = {
+				"files": ["requirements.txt"],
+				"optional-dependencies": {"url": ["requirements-url.txt"]},
+				"parallel": parallel,
+				}
+		metadata: dict = {"dynamic": ["dependencies", "optional-dependencies"]}
+		RequirementsMetadataHook(str(tmp_pathplus), config).update(metadata)
+		return metadata
+
+	with in_directory(tmp_pathplus):
+		assert update(parallel=True) == update(parallel=False)
+
+
+def test_parse_chunk_result():
+	# Workers only send plain data back to the parent, as Requirement objects are expensive to unpickle.
+	chunk = [(1, b"Foo[b,a]>=1; python_version < '3.8' --hash=sha256:abc"), (2, b"# comment"), (3, b"--pre")]
+	result = hatch_requirements_txt._parse_chunk(chunk, "requirements.txt", True, True)
+
+	assert result == (
+			[(("foo", ('a', 'b'), ">=1", None, 'python_version < "3.8"'), 1, (PipOption("--hash", "sha256:abc"), ))],
+			["# comment"],
+			[PipOption("--pre", None)],
+			[],
+			)
+	assert b"packaging" not in pickle.dumps(result)
+
+
+@pytest.mark.parametrize(
+		"filename, compress",
+		[
+				pytest.param("requirements.txt.gz", gzip.compress, id="gz"),
+				pytest.param("requirements.txt.bz2", bz2.compress, id="bz2"),
+				pytest.param("requirements.txt.xz", lzma.compress, id="xz"),
+				pytest.param("requirements-gz.txt", gzip.compress, id="gz_magic"),
+				pytest.param("requirements-bz2.txt", bz2.compress, id="bz2_magic"),
+				pytest.param("requirements-xz.txt", lzma.compress, id="xz_magic"),
+				],
+		)
+def test_load_compressed_requirements_files(
+		tmp_pathplus: PathPlus,
+		filename: str,
+		compress: Callable[[bytes], bytes],
+		):
+
+	contents = b"\xef\xbb\xbfFoo\r\n# fizz\r\nalembic==1.9.1 \\\r\n    --hash=sha256:abc\r\nbaz>1  # comment\r\n"
+	(tmp_pathplus / filename).write_bytes(compress(contents))
+
+	with in_directory(tmp_pathplus):
+		requirements, comments = load_requirements_files([filename])
+		records, _ = load_parsed_requirements([filename])
+
+	assert list(map(str, requirements)) == ["foo", "alembic==1.9.1", "baz>1"]
+	assert comments == ["# fizz"]
+	assert [r.lineno for r in records] == [1, 3, 5]
+
+
+@pytest.mark.parametrize(
+		"contents",
+		[
+				pytest.param(b"BZh\n", id="bzh"),
+				pytest.param(b"BZh9\n", id="bzh_block_size"),
+				pytest.param(b"BZh9 \n", id="bzh_block_size_space"),
+				pytest.param(b"BZh9-foo\n", id="bzh_block_size_name"),
+				],
+		)
+def test_load_requirements_files_like_magic(tmp_pathplus: PathPlus, contents: bytes):
+	# Plain text files starting with part of a compressed file's magic bytes are not decompressed
+	(tmp_pathplus / "requirements.txt").write_bytes(contents)
+
+	with in_directory(tmp_pathplus):
+		requirements, _ = load_requirements_files(["requirements.txt"])
+
+	assert [str(r) for r in requirements] == [contents.decode().strip().lower()]
+
+
+def test_load_empty_bz2_requirements_file(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements-bz2.txt").write_bytes(bz2.compress(b''))
+
+	with in_directory(tmp_pathplus):
+		assert load_requirements_files(["requirements-bz2.txt"]) == ([], [])
+
+
+def test_requirement_index(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_lines(["requests>=2.0", "numpy>=1.19"])
+	(tmp_pathplus / "requirements-http.txt").write_lines(["urllib3<2", "requests"])
+	(tmp_pathplus / "requirements-all.txt").write_lines([
+			"urllib3>=1.26",
+			"NumPy<2; python_version < '3.9'",
+			"numpy!=1.20.0",
+			])
+
+	with in_directory(tmp_pathplus):
+		index = RequirementIndex.from_files(
+				["requirements.txt"],
+				{"http": ["requirements-http.txt"], "all": ["requirements-all.txt", "requirements-http.txt"]},
+				)
+
+	assert index.groups == [None, "http", "all"]
+	assert len(index) == 3
+	assert "NumPy" in index
+	assert "scipy" not in index
+
+	assert index.groups_for("urllib3") == {"http", "all"}
+	assert index.groups_for("scipy") == set()
+
+	entry = index["numpy"][1]
+	assert entry.group == "all"
+	assert entry.requirement.filename == "requirements-all.txt"
+	assert entry.requirement.lineno == 2
+	assert entry.requirement.marker == 'python_version < "3.9"'
+
+	assert index.specifier("all", "numpy") == SpecifierSet("<2,!=1.20.0")
+	assert index.specifier("all", "urllib3") == SpecifierSet(">=1.26,<2")
+	assert index.specifier(None, "urllib3") == SpecifierSet()
+
+	assert index.names("http") == {"urllib3", "requests"}
+	assert index.union(None, "http") == {"numpy", "requests", "urllib3"}
+	assert index.intersection(None, "http") == {"requests"}
+	assert index.difference("all", None) == {"urllib3"}
+
+	with pytest.raises(KeyError, match="'docs'"):
+		index.names("docs")
+
+	restored = pickle.loads(pickle.dumps(index))
+	assert restored.groups == index.groups
+	assert [str(e.requirement) for e in restored["numpy"]] == [str(e.requirement) for e in index["numpy"]]
+
+
+def test_requirement_index_groups(tmp_pathplus: PathPlus, monkeypatch: pytest.MonkeyPatch):
+	(tmp_pathplus / "requirements-http.txt").write_lines(["urllib3<2", "requests"])
+	(tmp_pathplus / "requirements-empty.txt").write_lines(["# nothing here"])
+
+	opened = []
+	open_requirements_file = hatch_requirements_txt._open_requirements_file
+
+	def record_open(filename: str) -> ContextManager[IO[bytes]]:
+		opened.append(filename)
+		return open_requirements_file(filename)
+
+	monkeypatch.setattr(hatch_requirements_txt, "_open_requirements_file", record_open)
+
+	with in_directory(tmp_pathplus):
+		index = RequirementIndex.from_files(
+				[],
+				{
+						"http": ["requirements-http.txt"],
+						"all": ["requirements-http.txt", "requirements-empty.txt"],
+						"none": ["requirements-empty.txt"],
+						},
+				)
+
+	# Each file is only parsed once, however many groups use it.
+	assert opened == ["requirements-http.txt", "requirements-empty.txt"]
+
+	# Groups without any requirements, including the main dependencies, are still known.
+	assert index.groups == [None, "http", "all", "none"]
+	assert index.names(None) == set()
+	assert index.names("none") == set()
+	assert index.union(None, "http") == {"urllib3", "requests"}
+	assert index.groups_for("requests") == {"http", "all"}
+
+
+def test_canonical_order(tmp_pathplus: PathPlus):
+	lines = [
+			"Zope.Interface>=5",
+			"colorama; platform_system == 'Windows'",
+			"requests[socks,security]>=2,<3",
+			"requests>=2",
+			"attrs",
+			"colorama; os_name == 'nt'",
+			]
+
+	def update(lines: List[str]) -> dict:
+		(tmp_pathplus / "requirements.txt").write_lines(lines)
+		metadata: dict = {"dynamic": ["dependencies", "optional-dependencies"]}
+		config = {
+				"files": ["requirements.txt"],
+				"canonical-order": True,
+				"optional-dependencies": {"extra": ["requirements.txt"]},
+				}
+		with in_directory(tmp_pathplus):
+			RequirementsMetadataHook(str(tmp_pathplus), config).update(metadata)
+		return metadata
+
+	metadata = update(lines)
+	assert metadata["dependencies"] == [
+			"attrs",
+			'colorama; os_name == "nt"',
+			'colorama; platform_system == "Windows"',
+			"requests>=2",
+			"requests[security,socks]<3,>=2",
+			"zope-interface>=5",
+			]
+	assert metadata["optional-dependencies"]["extra"] == metadata["dependencies"]
+
+	assert update(lines[::-1]) == metadata
+	assert update(lines[3:] + lines[:3]) == metadata
+
+
+def test_python_version_tables():
+	tables = python_version_tables(
+			[
+					"foo",
+					"importlib-metadata>=3.6; python_version < '3.10'",
+					"tomli; python_full_version < '3.11.0'",
+					"bar; python_version >= '3.8' and python_version < '3.10'",
+					"colorama; platform_system == 'Windows' and platform_system != 'Windows'",
+					],
+			{
+					"test": [
+							"pytest",
+							"typing-extensions; python_version < '3.8' and extra == 'test'",
+							"never; extra == 'docs'",
+							],
+					},
+			["3.7", "3.9", "3.11.2"],
+			)
+
+	assert set(tables["environment"]) == {
+			"implementation_name",
+			"os_name",
+			"platform_machine",
+			"platform_python_implementation",
+			"platform_system",
+			"sys_platform",
+			}
+	assert tables["python"] == {
+			"3.7": {
+					"dependencies": ["foo", "importlib-metadata>=3.6", "tomli"],
+					"optional-dependencies": {"test": ["pytest", "typing-extensions"]},
+					},
+			"3.9": {
+					"dependencies": ["foo", "importlib-metadata>=3.6", "tomli", "bar"],
+					"optional-dependencies": {"test": ["pytest"]},
+					},
+			"3.11.2": {
+					"dependencies": ["foo"],
+					"optional-dependencies": {"test": ["pytest"]},
+					},
+			}
+
+
+def test_python_tables_option(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_lines(["foo", "tomli; python_version < '3.11'"])
+
+	config = {"files": ["requirements.txt"], "python-tables": {"versions": ["3.10", "3.11"]}}
+	metadata: dict = {"dynamic": ["dependencies"]}
+
+	with in_directory(tmp_pathplus):
+		RequirementsMetadataHook(str(tmp_pathplus), config).update(metadata)
+
+	tables = json.loads((tmp_pathplus / "requirements-tables.json").read_text())
+	assert tables["python"]["3.10"]["dependencies"] == ["foo", "tomli"]
+	assert tables["python"]["3.11"]["dependencies"] == ["foo"]
+
+	config["python-tables"] = {"file": "tables.json"}
+	with in_directory(tmp_pathplus), pytest.raises(ValueError, match="must specify a list of Python 'versions'"):
+		RequirementsMetadataHook(str(tmp_pathplus), config).update({"dynamic": ["dependencies"]})
+
+	config["python-tables"] = {"versions": "3.11"}
+	with in_directory(tmp_pathplus), pytest.raises(TypeError, match="'versions' must be a list of strings"):
+		RequirementsMetadataHook(str(tmp_pathplus), config).update({"dynamic": ["dependencies"]})
+
+
+@pytest.mark.parametrize("version", ["3", "3.10.x", "py3.10", "3.10 "])
+def test_python_version_tables_invalid_version(version: str):
+	with pytest.raises(ValueError, match="^Python versions must be in the form '3.X' or '3.X.Y'"):
+		python_version_tables(["foo"], {}, [version])
+
+
+def test_python_version_tables_patch_releases():
+	# A minor version is only accepted if each marker has the same result for all of its patch releases.
+	dependencies = [
+			"foo; python_full_version >= '3.10.2'",
+			"bar; python_full_version == '3.10.5'",
+			"baz; python_full_version < '3.9.1' or python_version >= '3.11'",
+			"fizz; python_full_version > '3.10'",
+			"buzz; python_full_version <= '3.10'",
+			]
+	tables = python_version_tables(dependencies, {}, ["3.8", "3.10.0", "3.10.1", "3.10.2", "3.10.5", "3.11"])
+
+	assert tables["python"] == {
+			"3.8": {"dependencies": ["baz", "buzz"], "optional-dependencies": {}},
+			"3.10.0": {"dependencies": ["buzz"], "optional-dependencies": {}},
+			"3.10.1": {"dependencies": ["fizz"], "optional-dependencies": {}},
+			"3.10.2": {"dependencies": ["foo", "fizz"], "optional-dependencies": {}},
+			"3.10.5": {"dependencies": ["foo", "bar", "fizz"], "optional-dependencies": {}},
+			"3.11": {"dependencies": ["foo", "baz", "fizz"], "optional-dependencies": {}},
+			}
+
+	for requirement in dependencies:
+		version = "3.9" if "3.9" in requirement else "3.10"
+		with pytest.raises(ValueError, match=rf"applies to some Python {version}\.x releases but not others"):
+			python_version_tables([requirement], {}, [version])
+
+
+def test_python_version_tables_evaluations(monkeypatch: pytest.MonkeyPatch):
+	# Each distinct marker is only evaluated once per version, unless it depends on the group.
+	evaluated = []
+	evaluate = Marker.evaluate
+
+	def record_evaluate(self: Marker, environment: Optional[Dict[str, str]] = None) -> bool:
+		assert environment is not None
+		evaluated.append((str(self), environment["extra"]))
+		return evaluate(self, environment)
+
+	monkeypatch.setattr(Marker, "evaluate", record_evaluate)
+
+	tables = python_version_tables(
+			["foo; os_name != 'unknown'"],
+			{
+					"a": ["foo; os_name != 'unknown'", "bar; extra == 'a'"],
+					"b": ["foo; os_name != 'unknown'", "bar; extra == 'a'"],
+					},
+			["3.11.0"],
+			)
+
+	assert tables["python"]["3.11.0"]["optional-dependencies"] == {"a": ["foo", "bar"], "b": ["foo"]}
+	assert evaluated == [('os_name != "unknown"', ''), ('extra == "a"', 'a'), ('extra == "a"', 'b')]
+
+
+def test_python_version_tables_implementation_version(monkeypatch: pytest.MonkeyPatch):
+	dependencies = ["foo; implementation_version < '3.9'"]
+	environment = hatch_requirements_txt.default_environment()
+
+	def implementation(name: str) -> Callable[[], dict]:
+		return lambda: {**environment, "implementation_name": name}
+
+	monkeypatch.setattr(hatch_requirements_txt, "default_environment", implementation("cpython"))
+	tables = python_version_tables(dependencies, {}, ["3.8", "3.9"])
+	assert tables["python"]["3.8"]["dependencies"] == ["foo"]
+	assert tables["python"]["3.9"]["dependencies"] == []
+
+	# On other implementations implementation_version is not the Python version
+	monkeypatch.setattr(hatch_requirements_txt, "default_environment", implementation("pypy"))
+	with pytest.raises(ValueError, match="as 'implementation_version' is not the Python version on pypy"):
+		python_version_tables(dependencies, {}, ["3.8"])
+
+
+def test_load_requirements_with_options(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_lines([
+			"--index-url https://pypi.example.com/simple  # private index",
+			"--extra-index-url=https://pypi.org/simple",
+			"--pre",
+			"alembic==1.9.1 \\",
+			"    --hash=sha256:a9781ed0979a20341c2cbb56bd22bd8db4fc1913f955e705444bd3a97c59fa32 \\",
+			"    --hash=sha256:f9f76e41061f5ebe27d4fe92600df9dd612521a7683f904dab328ba02cffa5a2",
+			"    # via -r requirements.in",
+			"hatch-requirements-txt",
+			"foo @ https://example.com/foo.zip#sha1=abc --no-binary :all:",
+			"-e git+https://github.com/example/bar.git#egg=bar",
+			])
+
+	with in_directory(tmp_pathplus):
+		requirements, global_options, comments = load_requirements_with_options(["requirements.txt"])
+
+	assert global_options == [
+			PipOption("--index-url", "https://pypi.example.com/simple"),
+			PipOption("--extra-index-url", "https://pypi.org/simple"),
+			PipOption("--pre", None),
+			PipOption("-e", "git+https://github.com/example/bar.git#egg=bar"),
+			]
+	assert comments == ["    # via -r requirements.in"]
+
+	assert [str(r) for r in requirements[:2]] == ["alembic==1.9.1", "hatch-requirements-txt"]
+	assert requirements[0].hashes == (
+			"sha256:a9781ed0979a20341c2cbb56bd22bd8db4fc1913f955e705444bd3a97c59fa32",
+			"sha256:f9f76e41061f5ebe27d4fe92600df9dd612521a7683f904dab328ba02cffa5a2",
+			)
+	assert requirements[1].options == ()
+	assert requirements[2].url == "https://example.com/foo.zip#sha1=abc"
+	assert requirements[2].options == (PipOption("--no-binary", ":all:"), )
+
+	# Options are not recorded unless requested.
+	with in_directory(tmp_pathplus):
+		assert load_parsed_requirements(["requirements.txt"])[0][0].options == ()
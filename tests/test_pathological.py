@@ -0,0 +1,108 @@
+# stdlib
+import time
+from typing import Iterator
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from hatch_requirements_txt import _requirement_slice, load_requirements_files, parse_requirements
+
+# Each input is a few hundred kilobytes. Quadratic (backtracking) behaviour takes minutes or hours
+# at this size, while a linear scan takes a fraction of a second, so the bound leaves plenty of room for slow CI.
+SIZE = 200_000
+TIME_LIMIT = 2.0
+
+
+class timer:
+
+	def __enter__(self) -> "timer":
+		self.start = time.perf_counter()
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.elapsed = time.perf_counter() - self.start
+
+
+pathological_lines = [
+		pytest.param("foo" + ' ' * SIZE + "bar", id="whitespace_run"),
+		pytest.param("foo" + " \t" * (SIZE // 2) + "bar", id="mixed_whitespace_run"),
+		pytest.param("foo" + ' ' * SIZE + "#comment", id="whitespace_before_comment"),
+		pytest.param("foo" + ' ' * SIZE + "--hash=sha256:abc", id="whitespace_before_option"),
+		pytest.param("foo" + '#' * SIZE, id="hashes"),
+		pytest.param("foo" + " -" * (SIZE // 2), id="dashes_after_whitespace"),
+		pytest.param("foo" + " --" * (SIZE // 3), id="double_dashes_after_whitespace"),
+		pytest.param("foo" + '-' * SIZE, id="dashes"),
+		pytest.param("foo" + " -#" * (SIZE // 3), id="dashes_and_hashes"),
+		pytest.param("foo @ https://example.com/" + "#-" * (SIZE // 2), id="url_fragment"),
+		]
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("line", pathological_lines)
+def test_requirement_slice_str(line: str):
+	with timer() as t:
+		_requirement_slice(line)
+
+	assert t.elapsed < TIME_LIMIT
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("line", pathological_lines)
+def test_requirement_slice_bytes(line: str):
+	encoded_line = line.encode("UTF-8")
+
+	with timer() as t:
+		_requirement_slice(encoded_line)
+
+	assert t.elapsed < TIME_LIMIT
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize(
+		"line",
+		[
+				pytest.param("foo" + ' ' * SIZE + "#comment", id="whitespace_before_comment"),
+				pytest.param("foo" + ' ' * SIZE + "--hash=sha256:abc", id="whitespace_before_option"),
+				pytest.param("foo" + ' ' * SIZE, id="trailing_whitespace"),
+				pytest.param(' ' * SIZE + "# comment", id="indented_comment"),
+				pytest.param(' ' * SIZE + "--index-url http://localhost", id="indented_option"),
+				pytest.param(' ' * SIZE, id="only_whitespace"),
+				],
+		)
+def test_parse_requirements(line: str):
+	with timer() as t:
+		parse_requirements([line])
+
+	assert t.elapsed < TIME_LIMIT
+
+
+def _continuations(count: int, whitespace: int) -> Iterator[str]:
+	yield "foo \\"
+	for _ in range(count):
+		yield '\\' + ' ' * whitespace
+	yield "  --hash=sha256:abc"
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize(
+		"lines",
+		[
+				pytest.param(list(_continuations(1, SIZE)), id="long_whitespace_after_backslash"),
+				pytest.param(list(_continuations(SIZE // 10, 10)), id="many_continuations"),
+				pytest.param(["foo \\" + ' ' * SIZE, ' ' * SIZE + "\\", "bar"], id="whitespace_around_continuation"),
+				pytest.param(["\\" * SIZE, "foo"], id="backslashes"),
+				],
+		)
+def test_load_requirements_files(tmp_pathplus: PathPlus, lines: Iterator[str]):
+	(tmp_pathplus / "requirements.txt").write_lines(lines)
+
+	with in_directory(tmp_pathplus), timer() as t:
+		try:
+			load_requirements_files(["requirements.txt"])
+		except ValueError:
+			# Some of these are invalid requirements; only the time taken to find that out matters.
+			pass
+
+	assert t.elapsed < TIME_LIMIT